@@ -1,18 +1,17 @@
 #!/usr/bin/env python3
 
 import argparse
+import hashlib
 import json
 import logging
 import os
-import subprocess
 import sys
-import textwrap
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import boto3
 import requests
+import urllib3
 from FaaSr_py import graph_functions as faasr_gf
-from github import Github
+from requests.adapters import HTTPAdapter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +21,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent per-action deployments (keeps us under provider rate limits)
+MAX_WORKERS = 8
+
+# GitHub Actions workflow generated for each action. secret_imports must already
+# be indented to the env block (SECRET_IMPORT_INDENT)
+WORKFLOW_YAML_TEMPLATE = """\
+name: {action_name}
+
+on:
+    workflow_dispatch:
+        inputs:
+            OVERWRITTEN:
+                description: "Overwritten fields"
+                required: true
+            PAYLOAD_URL:
+                description: "URL to payload"
+                required: true
+
+jobs:
+    {job_name}:
+        runs-on: {runs_on}
+        container: {container_image}
+
+        env:
+{secret_imports}
+            OVERWRITTEN: ${{{{ github.event.inputs.OVERWRITTEN }}}}
+            PAYLOAD_URL: ${{{{ github.event.inputs.PAYLOAD_URL }}}}
+
+        steps:
+          - name: Run Python entrypoint
+            run: |
+                cd /action
+                python3 faasr_entry.py
+"""
+SECRET_IMPORT_INDENT = " " * 12
+
+# FaaSType values (lowercased) that refer to AWS Lambda
+LAMBDA_FAAS_TYPES = frozenset({"lambda", "aws_lambda", "aws"})
+
+# Environment variables each platform needs in order to deploy
+REQUIRED_CREDENTIALS = {
+    "lambda": ["AWS_AccessKey", "AWS_SecretKey", "AWS_ARN"],
+    "githubactions": ["GH_PAT"],
+    "googlecloud": ["GCP_SecretKey"],
+}
+
+# Shared by concurrent deploy workers: the pool must be at least MAX_WORKERS wide
+# (default is 10), and adaptive retries back off on control-plane throttling
+BOTO_CONFIG_OPTIONS = dict(
+    max_pool_connections=max(50, MAX_WORKERS * 2),
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    connect_timeout=5,
+    read_timeout=60,
+    tcp_keepalive=True,
+)
+
+# Retry throttling and transient server errors on REST calls with backoff.
+# Every deploy request is safe to repeat (create conflicts fall back to update)
+HTTP_RETRY = urllib3.Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=None,
+    raise_on_status=False,
+)
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -45,6 +110,116 @@ def read_workflow_file(file_path):
         sys.exit(1)
 
 
+def create_http_session():
+    """Creates a requests.Session that retries with HTTP_RETRY"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS, max_retries=HTTP_RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def run_concurrently(func, names, max_workers=MAX_WORKERS):
+    """
+    Call func(name) for each name on a thread pool.
+
+    Every call runs to completion before exiting, so one failed deployment
+    doesn't abort the others mid-flight.
+
+    Args:
+        func: Callable taking a single name
+        names: Iterable of names (e.g. action names)
+        max_workers: Maximum number of concurrent calls
+    """
+    names = list(names)
+    if not names:
+        return
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+        futures = {executor.submit(func, name): name for name in names}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except SystemExit:
+                # Error already logged by the worker
+                failed.append(futures[future])
+            except Exception as e:
+                logger.error(f"Error processing {futures[future]}: {e}")
+                failed.append(futures[future])
+
+    if failed:
+        logger.error(f"Deployment failed for: {', '.join(sorted(failed))}")
+        sys.exit(1)
+
+
+def normalize_faas_type(faas_type):
+    """Lowercases a FaaSType and maps AWS Lambda aliases to lambda"""
+    faas_type = faas_type.lower()
+    if faas_type in LAMBDA_FAAS_TYPES:
+        return "lambda"
+    return faas_type
+
+
+def group_actions_by_faas_type(workflow_data):
+    """
+    Partitions the action list by the FaaSType of each action's server
+    in a single pass.
+
+    Args:
+        workflow_data: Full workflow JSON
+
+    Returns:
+        dict: Normalized FaaSType -> {action_name: action_data}
+    """
+    compute_servers = workflow_data["ComputeServers"]
+    actions_by_type = {}
+    for action_name, action_data in workflow_data["ActionList"].items():
+        server_config = compute_servers[action_data["FaaSServer"]]
+        faas_type = normalize_faas_type(server_config.get("FaaSType", ""))
+        actions_by_type.setdefault(faas_type, {})[action_name] = action_data
+    return actions_by_type
+
+
+def check_platform_credentials(faas_types):
+    """
+    Fails before anything is deployed if credentials are missing for any
+    platform, listing every missing environment variable.
+
+    Args:
+        faas_types: Iterable of normalized FaaSTypes that will be deployed
+    """
+    missing = [
+        env_var
+        for faas_type in sorted(faas_types)
+        for env_var in REQUIRED_CREDENTIALS.get(faas_type, [])
+        if not os.getenv(env_var)
+    ]
+    if missing:
+        logger.error(f"Missing required environment variables: {', '.join(missing)}")
+        sys.exit(1)
+
+
+def get_action_containers(workflow_data, actions):
+    """
+    Looks up the container image for each action, failing up front (and
+    listing every offender) if any action has no container specified.
+
+    Args:
+        workflow_data: Full workflow JSON
+        actions: Iterable of action names
+
+    Returns:
+        dict: Action name -> container image
+    """
+    action_containers = workflow_data.get("ActionContainers", {})
+    missing = [name for name in actions if not action_containers.get(name)]
+    if missing:
+        logger.error(f"No container specified for actions: {', '.join(missing)}")
+        sys.exit(1)
+    return {name: action_containers[name] for name in actions}
+
+
 def verify_containers(workflow_data):
     """Check if custom containers are specified via environment variable"""
     custom_container = os.getenv("CUSTOM_CONTAINER", "false").lower() == "true"
@@ -133,7 +308,7 @@ def generate_github_secret_imports(faasr_payload):
                 )
 
     # Indent each line for YAML formatting
-    indent = " " * 20
+    indent = SECRET_IMPORT_INDENT
     import_statements = "\n".join(f"{indent}{s}" for s in import_statements)
 
     return import_statements
@@ -146,7 +321,7 @@ def generate_user_defined_secret_imports(faasr_payload):
     for secret_name in faasr_payload.get("Secrets", []):
         import_statements.append(f"{secret_name}: ${{{{ secrets.{secret_name}}}}}")
 
-    indent = " " * 20
+    indent = SECRET_IMPORT_INDENT
     import_statements = "\n".join(f"{indent}{s}" for s in import_statements)
 
     return import_statements
@@ -154,83 +329,99 @@ def generate_user_defined_secret_imports(faasr_payload):
 
 def generate_serverless_yaml(action_name, container_image, secret_imports):
     """Generate YAML for serverless (GitHub-hosted runner)"""
-    return textwrap.dedent(
-        f"""\
-        name: {action_name}
-
-        on:
-            workflow_dispatch:
-                inputs:
-                    OVERWRITTEN:
-                        description: "Overwritten fields"
-                        required: true
-                    PAYLOAD_URL:
-                        description: "URL to payload"
-                        required: true
-
-        jobs:
-            run_docker_image:
-                runs-on: ubuntu-latest
-                container: {container_image}
-
-                env:
-{secret_imports}
-                    OVERWRITTEN: ${{{{ github.event.inputs.OVERWRITTEN }}}}
-                    PAYLOAD_URL: ${{{{ github.event.inputs.PAYLOAD_URL }}}}
-
-                steps:
-                  - name: Run Python entrypoint
-                    run: |
-                        cd /action
-                        python3 faasr_entry.py
-    """
+    return WORKFLOW_YAML_TEMPLATE.format(
+        action_name=action_name,
+        job_name="run_docker_image",
+        runs_on="ubuntu-latest",
+        container_image=container_image,
+        secret_imports=secret_imports,
     )
 
 
 def generate_vm_yaml(action_name, container_image, secret_imports):
     """Generate YAML for VM (self-hosted runner)"""
-    return textwrap.dedent(
-        f"""\
-        name: {action_name}
-
-        on:
-            workflow_dispatch:
-                inputs:
-                    OVERWRITTEN:
-                        description: "Overwritten fields"
-                        required: true
-                    PAYLOAD_URL:
-                        description: "URL to payload"
-                        required: true
-
-        jobs:
-            run_on_vm:
-                runs-on: self-hosted
-                container: {container_image}
-
-                env:
-{secret_imports}
-                    OVERWRITTEN: ${{{{ github.event.inputs.OVERWRITTEN }}}}
-                    PAYLOAD_URL: ${{{{ github.event.inputs.PAYLOAD_URL }}}}
-
-                steps:
-                  - name: Run Python entrypoint
-                    run: |
-                        cd /action
-                        python3 faasr_entry.py
-    """
+    return WORKFLOW_YAML_TEMPLATE.format(
+        action_name=action_name,
+        job_name="run_on_vm",
+        runs_on="self-hosted",
+        container_image=container_image,
+        secret_imports=secret_imports,
     )
 
 
-def deploy_to_github(workflow_data):
+def git_blob_sha(content):
+    """Returns the SHA git assigns to a blob with the given text content"""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def commit_workflow_files(repo, branch, files, message):
+    """
+    Commits several files to a branch as one commit using the Git Data API.
+    Files whose content already matches the branch are left out, and no
+    commit is made if nothing changed.
+
+    Args:
+        repo: PyGithub Repository
+        branch: Branch to commit to
+        files: Dict mapping file path to file content
+        message: Commit message
+
+    Returns:
+        list: Paths that were created or updated
+    """
+    from github import InputGitTreeElement
+
+    ref = repo.get_git_ref(f"heads/{branch}")
+    base_commit = repo.get_git_commit(ref.object.sha)
+
+    # Compare against blob SHAs on the branch instead of fetching file contents
+    existing = {
+        element.path: element.sha
+        for element in repo.get_git_tree(base_commit.tree.sha, recursive=True).tree
+    }
+    changed = {
+        path: content
+        for path, content in files.items()
+        if existing.get(path) != git_blob_sha(content)
+    }
+
+    if not changed:
+        return []
+
+    tree_elements = [
+        InputGitTreeElement(path=path, mode="100644", type="blob", content=content)
+        for path, content in changed.items()
+    ]
+    tree = repo.create_git_tree(tree_elements, base_commit.tree)
+
+    commit = repo.create_git_commit(message, tree, [base_commit])
+    ref.edit(commit.sha)
+
+    return list(changed)
+
+
+def deploy_to_github(workflow_data, github_actions):
     """Deploys GH functions to GitHub Actions"""
+    if not github_actions:
+        logger.info("No actions found for GitHub Actions deployment")
+        return
+
     github_token = os.getenv("GH_PAT")
 
     if not github_token:
         logger.error("GH_PAT environment variable not set")
         sys.exit(1)
 
-    g = Github(github_token)
+    # Imported here so deploys that skip GitHub don't pay for PyGithub
+    from github import Auth, Github, GithubRetry
+
+    # Retry transient errors and secondary rate limits with backoff
+    g = Github(
+        auth=Auth.Token(github_token),
+        retry=GithubRetry(total=5, backoff_factor=0.5),
+        timeout=30,
+    )
 
     # Get the workflow name for prefixing
     workflow_name = workflow_data.get("WorkflowName")
@@ -245,18 +436,7 @@ def deploy_to_github(workflow_data):
     # Get the current repository
     repo_name = os.getenv("GITHUB_REPOSITORY")
 
-    # Filter actions to be deployed to GitHub Actions
-    github_actions = {}
-    for action_name, action_data in workflow_data["ActionList"].items():
-        server_name = action_data["FaaSServer"]
-        server_config = workflow_data["ComputeServers"][server_name]
-        faas_type = server_config["FaaSType"].lower()
-        if faas_type == "githubactions":
-            github_actions[action_name] = action_data
-
-    if not github_actions:
-        logger.info("No actions found for GitHub Actions deployment")
-        return
+    action_containers = get_action_containers(workflow_data, github_actions)
 
     try:
         repo = g.get_repo(repo_name)
@@ -265,10 +445,16 @@ def deploy_to_github(workflow_data):
         default_branch = repo.default_branch
         logger.info(f"Using branch: {default_branch}")
 
-        # User-defined secrets (workflow-level, same for all functions)
-        user_defined_secret_imports = generate_user_defined_secret_imports(workflow_data)
+        # Secrets are workflow-level, so the env block is the same for all functions
+        secret_imports = generate_github_secret_imports(workflow_data)
+        user_defined_secret_imports = generate_user_defined_secret_imports(
+            workflow_data
+        )
+        if user_defined_secret_imports:
+            secret_imports += "\n" + user_defined_secret_imports
 
-        # Deploy each action
+        # Render every action's workflow file up front
+        workflow_files = {}
         for action_name, action_data in github_actions.items():
             # Create prefixed action name using workflow_name-action_name format
             prefixed_action_name = f"{json_prefix}-{action_name}"
@@ -276,18 +462,7 @@ def deploy_to_github(workflow_data):
             requires_vm = action_data.get("RequiresVM", False)
 
             # Create workflow file
-            # Get container image, with fallback to default
-            container_image = workflow_data.get("ActionContainers", {}).get(action_name)
-
-            # Ensure container image is specified
-            if not container_image:
-                logger.error(f"No container specified for action: {action_name}")
-                sys.exit(1)
-
-            # Dynamically set required secrets and variables
-            secret_imports = generate_github_secret_imports(workflow_data)
-            if user_defined_secret_imports:
-                secret_imports += "\n" + user_defined_secret_imports
+            container_image = action_containers[action_name]
 
             if requires_vm:
                 workflow_content = generate_vm_yaml(
@@ -298,45 +473,30 @@ def deploy_to_github(workflow_data):
                     prefixed_action_name, container_image, secret_imports
                 )
 
-            # Create or update the workflow file
             workflow_path = f".github/workflows/{prefixed_action_name}.yml"
-            try:
-                # Try to get the file first
-                contents = repo.get_contents(workflow_path)
-
-                # Update YAML file
-                repo.update_file(
-                    path=workflow_path,
-                    message=f"Update workflow for {prefixed_action_name}",
-                    content=workflow_content,
-                    sha=contents.sha,
-                    branch=default_branch,
-                )
-                logger.info(f"Successfully updated {workflow_path}")
-            except Exception as e:
-                if "Not Found" in str(e) or "404" in str(e):
-                    # If file doesn't exist, create it
-                    logger.info(f"File {workflow_path} doesn't exist, creating...")
-                    repo.create_file(
-                        path=workflow_path,
-                        message=f"Add workflow for {prefixed_action_name}",
-                        content=workflow_content,
-                        branch=default_branch,
-                    )
-                    logger.info(f"Successfully created {workflow_path}")
-                else:
-                    logger.info(f"Error updating/creating {workflow_path}: {str(e)}")
-                    # Try to get more details about the error
-                    if hasattr(e, "data"):
-                        logger.error(f"Error details: {e.data}")
-                    if hasattr(e, "status"):
-                        logger.error(f"HTTP status: {e.status}")
-                    raise e
-
-            logger.info(f"Successfully deployed {prefixed_action_name} to GitHub")
+            workflow_files[workflow_path] = workflow_content
+
+        # Create or update all changed workflow files in a single commit
+        changed_paths = commit_workflow_files(
+            repo,
+            default_branch,
+            workflow_files,
+            message=f"Deploy workflows for {workflow_name}",
+        )
+
+        for workflow_path in workflow_files:
+            if workflow_path in changed_paths:
+                logger.info(f"Successfully deployed {workflow_path} to GitHub")
+            else:
+                logger.info(f"{workflow_path} is unchanged, skipping")
 
     except Exception as e:
         logger.error(f"Error deploying to GitHub: {str(e)}")
+        # Try to get more details about the error
+        if hasattr(e, "data"):
+            logger.error(f"Error details: {e.data}")
+        if hasattr(e, "status"):
+            logger.error(f"HTTP status: {e.status}")
         sys.exit(1)
 
 
@@ -369,21 +529,14 @@ def get_lambda_credentials(workflow_data):
     return (aws_access_key, aws_secret_key, aws_region, aws_arn)
 
 
-def deploy_to_aws(workflow_data):
+def deploy_to_aws(workflow_data, lambda_actions):
     """Deploys functions to AWS Lambda"""
-    # Filter actions that should be deployed to AWS Lambda
-    lambda_actions = {}
-    for action_name, action_data in workflow_data["ActionList"].items():
-        server_name = action_data["FaaSServer"]
-        server_config = workflow_data["ComputeServers"][server_name]
-        faas_type = server_config["FaaSType"].lower()
-        if faas_type in ["lambda", "aws_lambda", "aws"]:
-            lambda_actions[action_name] = action_data
-
     if not lambda_actions:
         logger.info("No actions found for AWS Lambda deployment")
         return
 
+    action_containers = get_action_containers(workflow_data, lambda_actions)
+
     # Get the workflow name to prepend to function names
     workflow_name = workflow_data.get("WorkflowName")
 
@@ -396,160 +549,153 @@ def deploy_to_aws(workflow_data):
         workflow_data
     )
 
+    # Imported here so deploys that skip AWS don't pay for boto3
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+
     lambda_client = boto3.client(
         "lambda",
         aws_access_key_id=aws_access_key,
         aws_secret_access_key=aws_secret_key,
         region_name=aws_region,
+        config=Config(**BOTO_CONFIG_OPTIONS),
     )
 
-    # Process each action in the workflow
-    for action_name, action_data in lambda_actions.items():
-        try:
-            # Create prefixed function name using workflow_name-action_name format
-            prefixed_func_name = f"{workflow_name}-{action_name}"
+    # List deployed functions once instead of probing each one. This needs
+    # lambda:ListFunctions; without it, fall back to a get_function per action
+    try:
+        paginator = lambda_client.get_paginator("list_functions")
+        existing_functions = {
+            function["FunctionName"]
+            for page in paginator.paginate()
+            for function in page["Functions"]
+        }
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "AccessDeniedException":
+            logger.error(f"Error listing AWS Lambda functions: {str(e)}")
+            sys.exit(1)
+        logger.info(
+            "Not permitted to list Lambda functions, checking each function instead"
+        )
+        existing_functions = None
+    except Exception as e:
+        logger.error(f"Error listing AWS Lambda functions: {str(e)}")
+        sys.exit(1)
+
+    # Settings shared by every new function, built once
+    # TODO: fetch timeout and memory size from workflow file
+    create_kwargs = {
+        "PackageType": "Image",
+        "Role": aws_arn,
+        "Timeout": 900,
+        "MemorySize": 1024,
+    }
 
-            # Get container image for AWS Lambda (must be an Amazon ECR image URI)
-            container_image = workflow_data.get("ActionContainers", {}).get(action_name)
-            if not container_image:
-                logger.error(f"No container specified for action: {action_name}")
-                sys.exit(1)
+    # Deploy actions concurrently, sharing the (thread-safe) Lambda client
+    run_concurrently(
+        lambda action_name: deploy_lambda_action(
+            action_name,
+            action_containers[action_name],
+            workflow_data,
+            lambda_client,
+            create_kwargs,
+            existing_functions,
+        ),
+        lambda_actions,
+    )
 
-            # TODO: remove this
-            # Check payload size before deployment
-            # payload_size = len(workflow_data.encode("utf-8"))
-            # if payload_size > 4000:  # Lambda env var limit is ~4KB
-            #    logger.error(
-            #        f"Warning: SECRET_PAYLOAD size ({payload_size} bytes) may exceed Lambda environment variable limits"
-            #    )
 
-            # Check if function already exists first
+def deploy_lambda_action(
+    action_name,
+    container_image,
+    workflow_data,
+    lambda_client,
+    create_kwargs,
+    existing_functions,
+):
+    """
+    Creates or updates a single Lambda function for an action.
+
+    Args:
+        action_name: Name of the action
+        container_image: Container image for the action (an Amazon ECR image URI)
+        workflow_data: Full workflow JSON
+        lambda_client: boto3 Lambda client
+        create_kwargs: create_function arguments shared by all new functions
+        existing_functions: Set of function names already deployed, or None
+            to look each function up with get_function
+    """
+    from botocore.exceptions import WaiterError
+
+    # Create prefixed function name using workflow_name-action_name format
+    prefixed_func_name = f"{workflow_data['WorkflowName']}-{action_name}"
+
+    try:
+        if existing_functions is None:
             try:
                 lambda_client.get_function(FunctionName=prefixed_func_name)
-                logger.info(
-                    f"Function {prefixed_func_name} already exists, updating..."
-                )
-                # Update existing function
-                lambda_client.update_function_code(
-                    FunctionName=prefixed_func_name, ImageUri=container_image
-                )
+                function_exists = True
+            except lambda_client.exceptions.ResourceNotFoundException:
+                function_exists = False
+        else:
+            function_exists = prefixed_func_name in existing_functions
 
-                # Wait for the function update to complete
-                logger.info(
-                    f"Waiting for {prefixed_func_name} code update to complete..."
-                )
-                max_attempts = 60  # Wait up to 5 minutes
-                attempt = 0
-                while attempt < max_attempts:
-                    try:
-                        response = lambda_client.get_function(
-                            FunctionName=prefixed_func_name
-                        )
-                        state = response["Configuration"]["State"]
-                        last_update_status = response["Configuration"][
-                            "LastUpdateStatus"
-                        ]
-
-                        if state == "Active" and last_update_status == "Successful":
-                            break
-                        elif state == "Failed" or last_update_status == "Failed":
-                            sys.exit(1)
-                        else:
-                            time.sleep(5)
-                            attempt += 1
-                    except Exception as e:
-                        logger.info(f"Error checking function state: {str(e)}")
-                        time.sleep(5)
-                        attempt += 1
-
-                if attempt >= max_attempts:
-                    logger.error(
-                        f"Timeout waiting for {prefixed_func_name} update to complete"
-                    )
-                    sys.exit(1)
-
-                # Now update environment variables
-                lambda_client.update_function_configuration(
+        if function_exists:
+            logger.info(f"Function {prefixed_func_name} already exists, updating...")
+            # Update existing function
+            lambda_client.update_function_code(
+                FunctionName=prefixed_func_name, ImageUri=container_image
+            )
+
+            # Wait for the function update to complete (up to 5 minutes)
+            logger.info(f"Waiting for {prefixed_func_name} code update to complete...")
+            try:
+                lambda_client.get_waiter("function_updated_v2").wait(
                     FunctionName=prefixed_func_name,
+                    WaiterConfig={"Delay": 2, "MaxAttempts": 150},
                 )
-                logger.info(f"Successfully updated {prefixed_func_name} on AWS Lambda")
+            except WaiterError as e:
+                logger.error(f"Update of {prefixed_func_name} did not complete: {e}")
+                sys.exit(1)
 
-            except lambda_client.exceptions.ResourceNotFoundException:
-                # Function doesn't exist, create it
-                logger.info(f"Creating new Lambda function: {prefixed_func_name}")
-
-                # TODO: is minimal function necessary here?
-                try:
-                    lambda_client.create_function(
-                        FunctionName=prefixed_func_name,
-                        PackageType="Image",
-                        Code={"ImageUri": container_image},
-                        Role=aws_arn,
-                        Timeout=300,
-                        MemorySize=128,
-                    )
-
-                    # Wait for the function to become active before updating
-                    logger.info(f"Waiting for {prefixed_func_name} to become active...")
-                    max_attempts = 120  # Wait up to 10 minutes
-                    attempt = 0
-                    while attempt < max_attempts:
-                        try:
-                            response = lambda_client.get_function(
-                                FunctionName=prefixed_func_name
-                            )
-                            state = response["Configuration"]["State"]
-
-                            if state == "Active":
-                                logger.info(
-                                    f"Function {prefixed_func_name} is now active"
-                                )
-                                break
-                            elif state == "Failed":
-                                logger.error(
-                                    f"Function {prefixed_func_name} creation failed"
-                                )
-                                sys.exit(1)
-                            else:
-                                logger.info(f"Function state: {state}, waiting...")
-                                time.sleep(5)
-                                attempt += 1
-                        except Exception as e:
-                            logger.error(f"Error checking function state: {str(e)}")
-                            time.sleep(5)
-                            attempt += 1
-
-                    if attempt >= max_attempts:
-                        logger.error(
-                            f"Timeout while waiting for {prefixed_func_name} to become active"
-                        )
-                        sys.exit(1)
-
-                    # Now update with full configuration
-                    # TODO: fetch timeout and memory size from workflow file
-                    lambda_client.update_function_configuration(
-                        FunctionName=prefixed_func_name,
-                        Timeout=900,
-                        MemorySize=1024,
-                    )
-                    logger.info(f"Updated {prefixed_func_name} with full configuration")
-
-                except Exception as minimal_error:
-                    logger.error(f"Minimal creation failed: {minimal_error}")
-                    raise minimal_error
-        except Exception as e:
-            logger.error(f"Error deploying {prefixed_func_name} to AWS: {str(e)}")
-            # logger.error additional debugging information
-            if "RequestEntityTooLargeException" in str(e):
-                logger.error(f"Payload too large - size: {len(workflow_data)} bytes")
-                logger.error(
-                    "Consider reducing workflow complexity or using external storage"
-                )
-            elif "InvalidParameterValueException" in str(e):
-                logger.error(
-                    "Check Lambda configuration parameters (memory, timeout, role)"
+            logger.info(f"Successfully updated {prefixed_func_name} on AWS Lambda")
+
+        else:
+            # Function doesn't exist, create it
+            logger.info(f"Creating new Lambda function: {prefixed_func_name}")
+
+            # Create with the full configuration in one call
+            lambda_client.create_function(
+                FunctionName=prefixed_func_name,
+                Code={"ImageUri": container_image},
+                **create_kwargs,
+            )
+
+            # Wait for the function to become active (up to 10 minutes)
+            logger.info(f"Waiting for {prefixed_func_name} to become active...")
+            try:
+                lambda_client.get_waiter("function_active_v2").wait(
+                    FunctionName=prefixed_func_name,
+                    WaiterConfig={"Delay": 2, "MaxAttempts": 300},
                 )
-            sys.exit(1)
+            except WaiterError as e:
+                logger.error(f"{prefixed_func_name} did not become active: {e}")
+                sys.exit(1)
+            logger.info(f"Function {prefixed_func_name} is now active")
+    except Exception as e:
+        logger.error(f"Error deploying {prefixed_func_name} to AWS: {str(e)}")
+        # logger.error additional debugging information
+        if "RequestEntityTooLargeException" in str(e):
+            logger.error(f"Payload too large - size: {len(workflow_data)} bytes")
+            logger.error(
+                "Consider reducing workflow complexity or using external storage"
+            )
+        elif "InvalidParameterValueException" in str(e):
+            logger.error(
+                "Check Lambda configuration parameters (memory, timeout, role)"
+            )
+        sys.exit(1)
 
 
 def get_openwhisk_credentials(workflow_data):
@@ -565,7 +711,7 @@ def get_openwhisk_credentials(workflow_data):
     sys.exit(1)
 
 
-def deploy_to_ow(workflow_data):
+def deploy_to_ow(workflow_data, ow_actions):
     # Get OpenWhisk credentials
     # TODO: AllowSelfSignedCertifcate
     api_host, namespace = get_openwhisk_credentials(workflow_data)
@@ -574,88 +720,75 @@ def deploy_to_ow(workflow_data):
     workflow_name = workflow_data.get("WorkflowName", "default")
     json_prefix = workflow_name
 
-    # Filter actions that should be deployed to OpenWhisk
-    ow_actions = {}
-    for action_name, action_data in workflow_data["ActionList"].items():
-        server_name = action_data["FaaSServer"]
-        server_config = workflow_data["ComputeServers"][server_name]
-        faas_type = server_config["FaaSType"].lower()
-        if faas_type == "openwhisk":
-            ow_actions[action_name] = action_data
-
     if not ow_actions:
         logger.info("No actions found for OpenWhisk deployment")
         return
 
-    # Set up wsk properties
-    subprocess.run(f"wsk property set --apihost {api_host}", shell=True)
+    action_containers = get_action_containers(workflow_data, ow_actions)
+
+    if not api_host.startswith(("http://", "https://")):
+        api_host = f"https://{api_host}"
+    actions_url = f"{api_host.rstrip('/')}/api/v1/namespaces/{namespace}/actions"
+
+    # Shared session so concurrent workers reuse connections
+    session = create_http_session()
 
-    # Set authentication using API key from environment variable
+    # Set authentication using API key ("user:password") from environment variable
     ow_api_key = os.getenv("OW_APIkey")
     if ow_api_key:
-        subprocess.run(f"wsk property set --auth {ow_api_key}", shell=True)
+        if ":" not in ow_api_key:
+            logger.error("OW_APIkey must be in 'user:key' format")
+            sys.exit(1)
+        session.auth = tuple(ow_api_key.split(":", 1))
         logger.info("Using OpenWhisk with API key authentication")
     else:
         logger.info("Using OpenWhisk without authentication")
 
-    # Always use insecure flag to bypass certificate issues
-    subprocess.run("wsk property set --insecure", shell=True)
-
-    # TODO: why is this necessary?
-    # Set environment variable to handle certificate issue
-    env = os.environ.copy()
-    env["GODEBUG"] = "x509ignoreCN=0"
-
-    # Process each action in the workflow
-    for action_name, action_data in ow_actions.items():
-        try:
-            # Create prefixed function name using workflow_name-action_name format
-            prefixed_func_name = f"{json_prefix}-{action_name}"
-
-            # Create or update OpenWhisk action using wsk CLI
-            try:
-                # First check if action exists (add --insecure flag)
-                check_cmd = (
-                    f"wsk action get {prefixed_func_name} --insecure >/dev/null 2>&1"
-                )
-                exists = subprocess.run(check_cmd, shell=True, env=env).returncode == 0
-
-                # Get container image, with fallback to default
-                container_image = workflow_data.get("ActionContainers", {}).get(
-                    action_name
-                )
-
-                if not container_image:
-                    logger.error(f"No container specified for action: {action_name}")
-                    sys.exit(1)
+    # Always skip certificate verification to bypass certificate issues
+    session.verify = False
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    # Deploy actions concurrently
+    run_concurrently(
+        lambda action_name: deploy_ow_action(
+            session,
+            actions_url,
+            f"{json_prefix}-{action_name}",
+            action_containers[action_name],
+        ),
+        ow_actions,
+    )
 
-                if exists:
-                    # Update existing action (add --insecure flag)
-                    cmd = f"wsk action update {prefixed_func_name} --docker {container_image} --insecure"  # noqa E501
-                else:
-                    # Create new action (add --insecure flag)
-                    cmd = f"wsk action create {prefixed_func_name} --docker {container_image} --insecure"  # noqa E501
 
-                result = subprocess.run(
-                    cmd, shell=True, capture_output=True, text=True, env=env
-                )
+def deploy_ow_action(session, actions_url, prefixed_func_name, container_image):
+    """
+    Creates or updates a single OpenWhisk action using the REST API.
 
-                if result.returncode != 0:
-                    raise Exception(
-                        f"Failed to {'update' if exists else 'create'} action: {result.stderr}"
-                    )
+    Args:
+        session: requests.Session with OpenWhisk auth configured
+        actions_url: Actions endpoint for the namespace
+        prefixed_func_name: Action name in workflow_name-action_name format
+        container_image: Docker image for the action
+    """
+    try:
+        # overwrite=true creates the action or replaces an existing one
+        response = session.put(
+            f"{actions_url}/{prefixed_func_name}",
+            params={"overwrite": "true"},
+            json={"exec": {"kind": "blackbox", "image": container_image}},
+            timeout=60,
+        )
 
-                logger.info(f"Successfully deployed {prefixed_func_name} to OpenWhisk")
+        if response.status_code != 200:
+            raise Exception(
+                f"Failed to deploy action: {response.status_code} - {response.text}"
+            )
 
-            except Exception as e:
-                logger.error(
-                    f"Error deploying {prefixed_func_name} to OpenWhisk: {str(e)}"
-                )
-                sys.exit(1)
+        logger.info(f"Successfully deployed {prefixed_func_name} to OpenWhisk")
 
-        except Exception as e:
-            logger.error(f"Error processing {prefixed_func_name}: {str(e)}")
-            sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error deploying {prefixed_func_name} to OpenWhisk: {str(e)}")
+        sys.exit(1)
 
 
 def get_gcp_resource_requirements(workflow_data, action_name, server_config):
@@ -732,7 +865,10 @@ def create_gcp_job_definition(container_image, service_account, resources):
     }
 
 
-def deploy_to_gcp(workflow_data):
+def deploy_to_gcp(workflow_data, gcp_actions):
+    if not gcp_actions:
+        logger.info("No actions found for GCP deployment")
+        return
 
     gcp_secret_key = os.getenv("GCP_SecretKey")
 
@@ -748,24 +884,11 @@ def deploy_to_gcp(workflow_data):
         logger.error("WorkflowName not specified in workflow file")
         sys.exit(1)
 
-    gcp_actions = {}
-    gcp_server_config = None
-    gcp_server_name = None
-
-    for action_name, action_data in workflow_data["ActionList"].items():
-        server_name = action_data["FaaSServer"]
-        server_config = workflow_data["ComputeServers"][server_name]
-        faas_type = server_config.get("FaaSType", "")
-
-        if faas_type.lower() == "googlecloud":
-            gcp_actions[action_name] = action_data
-            if not gcp_server_config:
-                gcp_server_config = server_config.copy()
-                gcp_server_name = server_name
+    # Use the server of the first GCP action
+    gcp_server_name = next(iter(gcp_actions.values()))["FaaSServer"]
+    gcp_server_config = workflow_data["ComputeServers"][gcp_server_name].copy()
 
-    if not gcp_actions:
-        logger.info("No actions found for GCP deployment")
-        return
+    action_containers = get_action_containers(workflow_data, gcp_actions)
 
     gcp_server_config["SecretKey"] = gcp_secret_key
 
@@ -787,123 +910,153 @@ def deploy_to_gcp(workflow_data):
 
     base_url = f"{endpoint}{namespace}/locations/{region}/jobs"
 
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {access_token}",
-    }
-
-    for action_name, action_data in gcp_actions.items():
-        job_name = f"{workflow_name}-{action_name}"
-
-        logger.info(f"Registering GCP Cloud Run Job: {job_name}")
-
-        container_image = workflow_data.get("ActionContainers", {}).get(action_name)
-
-        if not container_image:
-            logger.error(f"No container specified for action: {action_name}")
-            sys.exit(1)
+    # Shared session so concurrent workers reuse connections
+    session = create_http_session()
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        }
+    )
 
-        service_account = gcp_server_config.get("ClientEmail")
-        if not service_account:
-            logger.error(
-                f"ClientEmail (service account) is required for GoogleCloud server "
-                f"but not found in ComputeServers configuration"
-            )
-            sys.exit(1)
+    service_account = gcp_server_config.get("ClientEmail")
+    if not service_account:
+        logger.error(
+            f"ClientEmail (service account) is required for GoogleCloud server "
+            f"but not found in ComputeServers configuration"
+        )
+        sys.exit(1)
 
+    # Build every job definition up front, then register them concurrently
+    job_bodies = {}
+    for action_name in gcp_actions:
         resources = get_gcp_resource_requirements(
             workflow_data=workflow_data,
             action_name=action_name,
             server_config=gcp_server_config,
         )
 
-        job_body = create_gcp_job_definition(
-            container_image=container_image,
+        job_bodies[f"{workflow_name}-{action_name}"] = create_gcp_job_definition(
+            container_image=action_containers[action_name],
             service_account=service_account,
             resources=resources,
         )
 
-        create_url = base_url
-        create_params = {"jobId": job_name}
+    run_concurrently(
+        lambda job_name: deploy_gcp_job(
+            session, base_url, job_name, job_bodies[job_name]
+        ),
+        job_bodies,
+    )
 
-        response = requests.post(
-            create_url, json=job_body, headers=headers, params=create_params
-        )
+    logger.info(f"Successfully registered {len(gcp_actions)} GCP Cloud Run Jobs")
 
-        if response.status_code in [200, 201]:
-            logger.info(f"Successfully created Cloud Run Job: {job_name}")
-        elif response.status_code == 409:
-            logger.info(f"Job {job_name} already exists, updating...")
-            update_url = f"{base_url}/{job_name}"
 
-            response = requests.patch(update_url, json=job_body, headers=headers)
+def deploy_gcp_job(session, base_url, job_name, job_body):
+    """
+    Creates a Cloud Run Job, or updates it if it already exists.
 
-            if response.status_code in [200, 201]:
-                logger.info(f"Successfully updated Cloud Run Job: {job_name}")
-            else:
-                logger.error(f"Failed to update job {job_name}: {response.text}")
-                sys.exit(1)
+    Args:
+        session: requests.Session with GCP auth headers
+        base_url: Jobs endpoint for the project and region
+        job_name: Name of the job
+        job_body: Job definition
+    """
+    logger.info(f"Registering GCP Cloud Run Job: {job_name}")
+
+    response = session.post(
+        base_url, json=job_body, params={"jobId": job_name}, timeout=60
+    )
+
+    if response.status_code in [200, 201]:
+        logger.info(f"Successfully created Cloud Run Job: {job_name}")
+    elif response.status_code == 409:
+        logger.info(f"Job {job_name} already exists, updating...")
+        update_url = f"{base_url}/{job_name}"
+
+        response = session.patch(update_url, json=job_body, timeout=60)
+
+        if response.status_code in [200, 201]:
+            logger.info(f"Successfully updated Cloud Run Job: {job_name}")
         else:
-            logger.error(f"Failed to create job {job_name}: {response.text}")
+            logger.error(f"Failed to update job {job_name}: {response.text}")
             sys.exit(1)
-
-    logger.info(f"Successfully registered {len(gcp_actions)} GCP Cloud Run Jobs")
+    else:
+        logger.error(f"Failed to create job {job_name}: {response.text}")
+        sys.exit(1)
 
 
-def deploy_to_slurm(workflow_data):
+def deploy_to_slurm(workflow_data, actions):
     """
     Validate SLURM configuration and test connectivity.
     This function validates configuration and tests connectivity.
 
     Args:
         workflow_data: Full workflow JSON
+        actions: Dict of SLURM actions to deploy
     """
     logger.info("Validating SLURM configuration...")
 
-    # Find all SLURM actions
+    # Group SLURM actions by server
     slurm_actions = {}
     slurm_servers = {}
 
-    for action_name, action_data in workflow_data["ActionList"].items():
+    compute_servers = workflow_data["ComputeServers"]
+    for action_name, action_data in actions.items():
         server_name = action_data["FaaSServer"]
-        server_config = workflow_data["ComputeServers"][server_name]
-        faas_type = server_config.get("FaaSType", "")
-
-        if faas_type == "SLURM":
-            if server_name not in slurm_actions:
-                slurm_actions[server_name] = []
-                slurm_servers[server_name] = server_config.copy()
-            slurm_actions[server_name].append(action_name)
+        if server_name not in slurm_actions:
+            slurm_actions[server_name] = []
+            slurm_servers[server_name] = compute_servers[server_name].copy()
+        slurm_actions[server_name].append(action_name)
 
     if not slurm_actions:
         logger.info("No actions found for SLURM deployment")
         return
 
-    # Process each SLURM server
-    for server_name, actions in slurm_actions.items():
-        logger.info(f"Registering workflow for SLURM: {server_name}")
-        server_config = slurm_servers[server_name]
+    # Process SLURM servers concurrently; each ping can take up to its timeout
+    run_concurrently(
+        lambda server_name: validate_slurm_server(
+            server_name,
+            slurm_servers[server_name],
+            slurm_actions[server_name],
+            workflow_data,
+        ),
+        slurm_actions,
+    )
 
-        # Validate server configuration
-        validate_slurm_server_config(server_name, server_config)
+    logger.info(
+        f"SLURM configuration validated successfully. "
+        f"No persistent resources created - jobs will be submitted at invocation time."
+    )
 
-        # Test connectivity
-        if not test_slurm_connectivity(server_name, server_config):
-            logger.error(f"Failed to connect to SLURM server: {server_name}")
-            sys.exit(1)
 
-        # Validate each action
-        for action_name in actions:
-            validate_slurm_action(action_name, workflow_data, server_config)
+def validate_slurm_server(server_name, server_config, actions, workflow_data):
+    """
+    Validate one SLURM server's configuration, connectivity, and actions.
 
-        logger.info(
-            f"Successfully validated {len(actions)} action(s) for SLURM server '{server_name}'"
-        )
+    Args:
+        server_name: Name of the SLURM server
+        server_config: Server configuration dict
+        actions: Names of the actions assigned to this server
+        workflow_data: Full workflow JSON
+    """
+    logger.info(f"Registering workflow for SLURM: {server_name}")
+
+    # Validate server configuration
+    validate_slurm_server_config(server_name, server_config)
+
+    # Test connectivity
+    if not test_slurm_connectivity(server_name, server_config):
+        logger.error(f"Failed to connect to SLURM server: {server_name}")
+        sys.exit(1)
+
+    # Validate each action
+    for action_name in actions:
+        validate_slurm_action(action_name, workflow_data, server_config)
 
     logger.info(
-        f"SLURM configuration validated successfully. "
-        f"No persistent resources created - jobs will be submitted at invocation time."
+        f"Successfully validated {len(actions)} action(s) for SLURM server '{server_name}'"
     )
 
 
@@ -1067,6 +1220,16 @@ def get_slurm_resource_requirements(action_name, action_config, server_config):
     return config
 
 
+# Deploy function for each normalized FaaSType
+DEPLOYERS = {
+    "lambda": deploy_to_aws,
+    "githubactions": deploy_to_github,
+    "openwhisk": deploy_to_ow,
+    "googlecloud": deploy_to_gcp,
+    "slurm": deploy_to_slurm,
+}
+
+
 def main():
     args = parse_arguments()
     workflow_data = read_workflow_file(args.workflow_file)
@@ -1089,7 +1252,7 @@ def main():
     faas_types = set()
     for server in workflow_data.get("ComputeServers", {}).values():
         if "FaaSType" in server:
-            faas_types.add(server["FaaSType"].lower())
+            faas_types.add(normalize_faas_type(server["FaaSType"]))
 
     if not faas_types:
         logger.error("Error: No FaaSType found in workflow file")
@@ -1097,22 +1260,31 @@ def main():
 
     logger.info(f"Found FaaS platforms: {', '.join(faas_types)}")
 
-    # Deploy to each platform found
-    for faas_type in faas_types:
-        logger.info(f"\nDeploying to {faas_type}...")
-        if faas_type == "lambda":
-            deploy_to_aws(workflow_data)
-        elif faas_type == "githubactions":
-            deploy_to_github(workflow_data)
-        elif faas_type == "openwhisk":
-            deploy_to_ow(workflow_data)
-        elif faas_type == "googlecloud":
-            deploy_to_gcp(workflow_data)
-        elif faas_type == "slurm":
-            deploy_to_slurm(workflow_data)
-        else:
-            logger.error(f"Unsupported FaaSType: {faas_type}")
-            sys.exit(1)
+    unsupported = faas_types - DEPLOYERS.keys()
+    if unsupported:
+        logger.error(f"Unsupported FaaSType: {', '.join(sorted(unsupported))}")
+        sys.exit(1)
+
+    # Partition actions by platform once, rather than in every deployer
+    actions_by_type = group_actions_by_faas_type(workflow_data)
+
+    # Only platforms with actions are deployed, so only their credentials matter
+    platforms = [
+        faas_type for faas_type in faas_types if actions_by_type.get(faas_type)
+    ]
+
+    for faas_type in sorted(faas_types.difference(platforms)):
+        logger.info(f"No actions found for {faas_type}, skipping")
+
+    # Check credentials for every platform before deploying any
+    check_platform_credentials(platforms)
+
+    # Platforms are independent, so deploy to all of them concurrently
+    def deploy_platform(faas_type):
+        logger.info(f"Deploying to {faas_type}...")
+        DEPLOYERS[faas_type](workflow_data, actions_by_type[faas_type])
+
+    run_concurrently(deploy_platform, platforms)
 
 
 if __name__ == "__main__":
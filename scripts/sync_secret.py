@@ -4,13 +4,18 @@ import argparse
 import base64
 import json
 import logging
+import logging.handlers
 import os
 import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-import boto3
 import requests
-from botocore.exceptions import ClientError
+import urllib3
 from FaaSr_py import graph_functions as faasr_gf
+from requests.adapters import HTTPAdapter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +25,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-provider loggers, so each provider's output can be held back while
+# AWS and GCP sync concurrently
+aws_logger = logger.getChild("aws")
+gcp_logger = logger.getChild("gcp")
+
+# Serializes flushing of buffered provider output
+LOG_FLUSH_LOCK = threading.Lock()
+
+# Maximum number of secrets synced concurrently
+MAX_WORKERS = 8
+
+# One pooled connection per sync worker; adaptive retries back off when
+# Secrets Manager throttles concurrent writes
+BOTO_CONFIG_OPTIONS = dict(max_pool_connections=MAX_WORKERS, retries={"max_attempts": 10, "mode": "adaptive"})
+
+# Retry throttling and transient server errors on Secret Manager REST reads.
+# POSTs aren't retried: a repeated addVersion could store a duplicate version
+HTTP_RETRY = urllib3.Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                           allowed_methods=frozenset({"GET"}), raise_on_status=False)
+
+# FaaSType values (lowercased) that refer to AWS Lambda
+LAMBDA_FAAS_TYPES = frozenset({"lambda", "aws_lambda", "aws"})
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
@@ -74,7 +102,7 @@ def get_required_secrets(workflow_data):
         
         if faas_type == "githubactions":
             required_secrets.add(f"{server_name}_PAT")
-        elif faas_type in ["lambda", "aws_lambda", "aws"]:
+        elif faas_type in LAMBDA_FAAS_TYPES:
             required_secrets.add(f"{server_name}_AccessKey")
             required_secrets.add(f"{server_name}_SecretKey")
         elif faas_type == "googlecloud":
@@ -127,20 +155,20 @@ def get_aws_config(workflow_data, secrets):
     aws_server_name = None
     region = None
     for server_name, server_config in workflow_data.get("ComputeServers", {}).items():
-        if server_config.get("FaaSType", "").lower() in ["lambda", "aws_lambda", "aws"]:
+        if server_config.get("FaaSType", "").lower() in LAMBDA_FAAS_TYPES:
             aws_server_name = server_name
             region = server_config.get("Region")
             break
 
     if not aws_server_name:
-        logger.error("No Lambda server configuration found in workflow ComputeServers")
+        aws_logger.error("No Lambda server configuration found in workflow ComputeServers")
         sys.exit(1)
 
     aws_access_key = secrets.get(f"{aws_server_name}_AccessKey", "")
     aws_secret_key = secrets.get(f"{aws_server_name}_SecretKey", "")
     
     if not aws_access_key or not aws_secret_key:
-        logger.error(f"{aws_server_name}_AccessKey and {aws_server_name}_SecretKey not found in secrets")
+        aws_logger.error(f"{aws_server_name}_AccessKey and {aws_server_name}_SecretKey not found in secrets")
         sys.exit(1)
     
     # Fall back to DataStores region if not found in ComputeServers
@@ -151,37 +179,59 @@ def get_aws_config(workflow_data, secrets):
                 break
     
     region = region or "us-east-1"
-    logger.info(f"AWS credentials extracted, using region: {region}")
+    aws_logger.info(f"AWS credentials extracted, using region: {region}")
     return aws_access_key, aws_secret_key, region
 
 
 def sync_secret_to_aws(client, secret_name, secret_value):
     """Sync a single secret to AWS Secrets Manager"""
+    from botocore.exceptions import ClientError
+
     try:
-        client.describe_secret(SecretId=secret_name)
+        try:
+            current = client.get_secret_value(SecretId=secret_name)
+            if current.get("SecretString") == secret_value:
+                # Skip the write so an unchanged secret doesn't get a new version
+                aws_logger.info(f"Secret unchanged: {secret_name}")
+                return True
+        except ClientError as e:
+            # Keys scoped to write only can't read the value back, so update
+            # without comparing; a missing secret still falls through to create
+            if e.response['Error']['Code'] != 'AccessDeniedException':
+                raise
         client.update_secret(SecretId=secret_name, SecretString=secret_value)
-        logger.info(f"Updated secret: {secret_name}")
+        aws_logger.info(f"Updated secret: {secret_name}")
         return True
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceNotFoundException':
             try:
                 client.create_secret(Name=secret_name, SecretString=secret_value)
-                logger.info(f"Created secret: {secret_name}")
+                aws_logger.info(f"Created secret: {secret_name}")
+                return True
+            except client.exceptions.ResourceExistsException:
+                # The secret exists but has no current value yet
+                try:
+                    client.update_secret(SecretId=secret_name, SecretString=secret_value)
+                except ClientError as update_error:
+                    aws_logger.error(f"Failed to update secret {secret_name}: {update_error}")
+                    return False
+                aws_logger.info(f"Updated secret: {secret_name}")
                 return True
             except ClientError as create_error:
-                logger.error(f"Failed to create secret {secret_name}: {create_error}")
+                aws_logger.error(f"Failed to create secret {secret_name}: {create_error}")
                 return False
         else:
-            logger.error(f"Failed to check/update secret {secret_name}: {e}")
+            aws_logger.error(f"Failed to check/update secret {secret_name}: {e}")
             return False
 
 
 def sync_all_secrets_to_aws(client, secrets):
     """Sync all GitHub secrets to AWS Secrets Manager"""
-    logger.info(f"Starting sync of {len(secrets)} secrets to AWS...")
-    success = sum(1 for name, value in secrets.items() 
-                  if sync_secret_to_aws(client, name, str(value) if value else ""))
-    logger.info(f"AWS Sync complete: {success}/{len(secrets)} succeeded")
+    aws_logger.info(f"Starting sync of {len(secrets)} secrets to AWS...")
+    values = [str(value) if value else "" for value in secrets.values()]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        success = sum(executor.map(partial(sync_secret_to_aws, client), secrets, values))
+    aws_logger.info(f"AWS Sync complete: {success}/{len(secrets)} succeeded")
     return success == len(secrets)
 
 
@@ -197,13 +247,13 @@ def get_gcp_config(workflow_data, secrets):
             break
 
     if not gcp_config:
-        logger.error("No GoogleCloud configuration found in workflow ComputeServers")
+        gcp_logger.error("No GoogleCloud configuration found in workflow ComputeServers")
         sys.exit(1)
 
     gcp_secret_key = secrets.get(f"{gcp_server_name}_SecretKey")
     
     if not gcp_secret_key:
-        logger.error(f"{gcp_server_name}_SecretKey not found in secrets")
+        gcp_logger.error(f"{gcp_server_name}_SecretKey not found in secrets")
         sys.exit(1)
     
     # Normalize PEM key: replace escaped newlines with actual newlines
@@ -214,68 +264,170 @@ def get_gcp_config(workflow_data, secrets):
     client_email = gcp_config.get("ClientEmail")
     
     if not project_id or not client_email:
-        logger.error("Namespace (project ID) or ClientEmail not found in GCP configuration")
+        gcp_logger.error("Namespace (project ID) or ClientEmail not found in GCP configuration")
         sys.exit(1)
     
-    logger.info(f"GCP configuration extracted: project={project_id}")
+    gcp_logger.info(f"GCP configuration extracted: project={project_id}")
     return gcp_secret_key, project_id, client_email, gcp_server_name
 
 
-def sync_secret_to_gcp(headers, project_id, secret_name, secret_value):
+def sync_secret_to_gcp(session, project_id, secret_name, secret_value):
     """Sync a single secret to GCP Secret Manager using REST API"""
     base_url = f"https://secretmanager.googleapis.com/v1/projects/{project_id}/secrets"
     secret_url = f"{base_url}/{secret_name}"
     
     try:
-        response = requests.get(secret_url, headers=headers)
+        # Read the latest version; 404 means the secret (or any version) doesn't exist
+        response = session.get(f"{secret_url}/versions/latest:access")
         encoded_payload = base64.b64encode(secret_value.encode("UTF-8")).decode("UTF-8")
         version_body = {"payload": {"data": encoded_payload}}
         
-        if response.status_code == 200:
+        if response.status_code == 200 and response.json().get("payload", {}).get("data") == encoded_payload:
+            # Skip the write so an unchanged secret doesn't get a new version
+            gcp_logger.info(f"Secret unchanged: {secret_name}")
+            return True
+        
+        if response.status_code == 403:
+            # Not permitted to read secret values (no secretAccessor role), so
+            # check that the secret exists from its metadata instead
+            response = session.get(secret_url)
+        
+        # 400 (FAILED_PRECONDITION): the secret exists but its latest version is
+        # disabled or destroyed, e.g. a leaked credential being rotated
+        if response.status_code in [200, 400]:
             # Secret exists, add new version
-            version_response = requests.post(f"{secret_url}:addVersion", json=version_body, headers=headers)
+            version_response = session.post(f"{secret_url}:addVersion", json=version_body)
             if version_response.status_code in [200, 201]:
-                logger.info(f"Updated secret: {secret_name}")
+                gcp_logger.info(f"Updated secret: {secret_name}")
                 return True
-            logger.error(f"Failed to update secret {secret_name}: {version_response.text}")
+            gcp_logger.error(f"Failed to update secret {secret_name}: {version_response.text}")
             return False
             
         elif response.status_code == 404:
             # Secret doesn't exist, create it
             create_body = {"replication": {"automatic": {}}}
-            create_response = requests.post(f"{base_url}?secretId={secret_name}", 
-                                          json=create_body, headers=headers)
+            create_response = session.post(f"{base_url}?secretId={secret_name}", json=create_body)
             
-            if create_response.status_code in [200, 201]:
-                logger.info(f"Created secret: {secret_name}")
-                version_response = requests.post(f"{secret_url}:addVersion", 
-                                               json=version_body, headers=headers)
+            # 409: the secret exists but has no versions yet
+            if create_response.status_code in [200, 201, 409]:
+                if create_response.status_code == 409:
+                    gcp_logger.info(f"Secret already exists, adding first version: {secret_name}")
+                else:
+                    gcp_logger.info(f"Created secret: {secret_name}")
+                version_response = session.post(f"{secret_url}:addVersion", json=version_body)
                 if version_response.status_code in [200, 201]:
                     return True
-                logger.error(f"Failed to add version to secret {secret_name}: {version_response.text}")
+                gcp_logger.error(f"Failed to add version to secret {secret_name}: {version_response.text}")
                 return False
-            logger.error(f"Failed to create secret {secret_name}: {create_response.text}")
+            gcp_logger.error(f"Failed to create secret {secret_name}: {create_response.text}")
             return False
         else:
-            logger.error(f"Failed to check secret {secret_name}: {response.text}")
+            gcp_logger.error(f"Failed to check secret {secret_name}: {response.text}")
             return False
             
     except Exception as e:
-        logger.error(f"Exception while syncing secret {secret_name}: {e}")
+        gcp_logger.error(f"Exception while syncing secret {secret_name}: {e}")
         return False
 
 
-def sync_all_secrets_to_gcp(headers, project_id, secrets):
+def sync_all_secrets_to_gcp(session, project_id, secrets):
     """Sync all GitHub secrets to GCP Secret Manager"""
-    logger.info(f"Starting sync of {len(secrets)} secrets to GCP...")
-    success = sum(1 for name, value in secrets.items() 
-                  if sync_secret_to_gcp(headers, project_id, name, str(value) if value else ""))
-    logger.info(f"GCP Sync complete: {success}/{len(secrets)} succeeded")
+    gcp_logger.info(f"Starting sync of {len(secrets)} secrets to GCP...")
+    values = [str(value) if value else "" for value in secrets.values()]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        success = sum(executor.map(partial(sync_secret_to_gcp, session, project_id), secrets, values))
+    gcp_logger.info(f"GCP Sync complete: {success}/{len(secrets)} succeeded")
     return success == len(secrets)
 
 
+def sync_to_aws_secrets_manager(workflow_data, secrets):
+    """Sync secrets to AWS Secrets Manager. Returns True if all secrets synced."""
+    aws_logger.info("\n" + "="*60)
+    aws_logger.info("SYNCING TO AWS SECRETS MANAGER")
+    aws_logger.info("="*60)
+    
+    # Imported here so GCP-only runs don't pay for loading boto3
+    import boto3
+    from botocore.config import Config
+
+    try:
+        aws_access_key, aws_secret_key, aws_region = get_aws_config(workflow_data, secrets)
+        client = boto3.client('secretsmanager',
+                            aws_access_key_id=aws_access_key,
+                            aws_secret_access_key=aws_secret_key,
+                            region_name=aws_region,
+                            config=Config(**BOTO_CONFIG_OPTIONS))
+        
+        return sync_all_secrets_to_aws(client, secrets)
+    except Exception as e:
+        aws_logger.error(f"AWS sync failed: {e}")
+        return False
+
+
+def sync_to_gcp_secret_manager(workflow_data, secrets):
+    """Sync secrets to GCP Secret Manager. Returns True if all secrets synced."""
+    gcp_logger.info("\n" + "="*60)
+    gcp_logger.info("SYNCING TO GCP SECRET MANAGER")
+    gcp_logger.info("="*60)
+    
+    try:
+        gcp_secret_key, project_id, client_email, gcp_server_name = get_gcp_config(workflow_data, secrets)
+
+        from FaaSr_py.helpers.gcp_auth import refresh_gcp_access_token
+        
+        gcp_server_config = workflow_data["ComputeServers"][gcp_server_name].copy()
+        gcp_server_config["SecretKey"] = gcp_secret_key
+        gcp_server_config.setdefault("Region", "us-central1")
+        
+        temp_payload = {"ComputeServers": {gcp_server_name: gcp_server_config}}
+        access_token = refresh_gcp_access_token(temp_payload, gcp_server_name)
+        
+        # One session for all secrets so the connection is reused
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS, max_retries=HTTP_RETRY))
+        session.headers.update({
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        })
+        
+        return sync_all_secrets_to_gcp(session, project_id, secrets)
+
+    except Exception as e:
+        gcp_logger.error(f"GCP sync failed: {e}")
+        gcp_logger.error(f"Traceback: {traceback.format_exc()}")
+        return False
+
+
+def run_with_buffered_logs(sync, provider_logger, workflow_data, secrets):
+    """
+    Run a provider sync while holding back its log output, then emit it as
+    one block when the sync finishes so concurrent providers don't interleave.
+    """
+    handler = logging.handlers.BufferingHandler(capacity=sys.maxsize)
+    provider_logger.addHandler(handler)
+    provider_logger.propagate = False
+    try:
+        return sync(workflow_data, secrets)
+    finally:
+        provider_logger.removeHandler(handler)
+        provider_logger.propagate = True
+        with LOG_FLUSH_LOCK:
+            for record in handler.buffer:
+                logger.handle(record)
+
+
 def main():
     args = parse_arguments()
+    
+    # Check the sync targets first so a misconfigured run fails before any work
+    sync_to_aws = os.getenv("SYNC_TO_AWS", "false").lower() == "true"
+    sync_to_gcp = os.getenv("SYNC_TO_GCP", "false").lower() == "true"
+    
+    if not sync_to_aws and not sync_to_gcp:
+        logger.error("No sync target specified. Set SYNC_TO_AWS or SYNC_TO_GCP to true")
+        sys.exit(1)
+    
     workflow_data = read_workflow_file(args.workflow_file)
     logger.info(f"Successfully loaded workflow file: {args.workflow_file}")
 
@@ -301,67 +453,24 @@ def main():
         logger.error("No required secrets found in environment")
         sys.exit(1)
     
-    sync_to_aws = os.getenv("SYNC_TO_AWS", "false").lower() == "true"
-    sync_to_gcp = os.getenv("SYNC_TO_GCP", "false").lower() == "true"
-    
-    if not sync_to_aws and not sync_to_gcp:
-        logger.error("No sync target specified. Set SYNC_TO_AWS or SYNC_TO_GCP to true")
-        sys.exit(1)
-    
     logger.info(f"Sync targets - AWS: {sync_to_aws}, GCP: {sync_to_gcp}")
-    all_success = True
     
-    # Sync to AWS if enabled
+    targets = []
     if sync_to_aws:
-        logger.info("\n" + "="*60)
-        logger.info("SYNCING TO AWS SECRETS MANAGER")
-        logger.info("="*60)
-        
-        try:
-            aws_access_key, aws_secret_key, aws_region = get_aws_config(workflow_data, secrets)
-            client = boto3.client('secretsmanager',
-                                aws_access_key_id=aws_access_key,
-                                aws_secret_access_key=aws_secret_key,
-                                region_name=aws_region)
-            
-            if not sync_all_secrets_to_aws(client, secrets):
-                all_success = False
-        except Exception as e:
-            logger.error(f"AWS sync failed: {e}")
-            all_success = False
-    
-    # Sync to GCP if enabled
+        targets.append((sync_to_aws_secrets_manager, aws_logger))
     if sync_to_gcp:
-        logger.info("\n" + "="*60)
-        logger.info("SYNCING TO GCP SECRET MANAGER")
-        logger.info("="*60)
-        
-        try:
-            gcp_secret_key, project_id, client_email, gcp_server_name = get_gcp_config(workflow_data, secrets)
-
-            from FaaSr_py.helpers.gcp_auth import refresh_gcp_access_token
-            
-            gcp_server_config = workflow_data["ComputeServers"][gcp_server_name].copy()
-            gcp_server_config["SecretKey"] = gcp_secret_key
-            gcp_server_config.setdefault("Region", "us-central1")
-            
-            temp_payload = {"ComputeServers": {gcp_server_name: gcp_server_config}}
-            access_token = refresh_gcp_access_token(temp_payload, gcp_server_name)
-            
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {access_token}",
-            }
-            
-            if not sync_all_secrets_to_gcp(headers, project_id, secrets):
-                all_success = False
-                    
-        except Exception as e:
-            import traceback
-            logger.error(f"GCP sync failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            all_success = False
+        targets.append((sync_to_gcp_secret_manager, gcp_logger))
+    
+    if len(targets) == 1:
+        sync, _ = targets[0]
+        all_success = sync(workflow_data, secrets)
+    else:
+        # AWS and GCP are independent, so sync to both concurrently, buffering
+        # each provider's output so its lines stay together
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            results = list(executor.map(
+                lambda target: run_with_buffered_logs(*target, workflow_data, secrets), targets))
+        all_success = all(results)
     
     # Final status
     logger.info("\n" + "="*60)